@@ -0,0 +1,146 @@
+"""On-disk cache of generated commands for DoForMe."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from .config import CONFIG_DIR
+
+
+CACHE_FILE = CONFIG_DIR / "cmd_cache.jsonl"
+
+# Entries older than this are ignored and dropped on the next write
+CACHE_TTL = 30 * 24 * 60 * 60
+# Maximum number of entries kept; least recently used ones are evicted first
+CACHE_MAX_ENTRIES = 1000
+
+
+def _normalize(prompt):
+    """Normalize a prompt so whitespace differences share an entry.
+
+    Case is kept: prompts often name files, and a command generated for
+    "Foo.TXT" must not be served for "foo.txt".
+    """
+    return " ".join(prompt.split())
+
+
+def _hash_prompt(prompt):
+    """Return the cache key for a prompt."""
+    return hashlib.sha256(_normalize(prompt).encode("utf-8")).hexdigest()
+
+
+def _is_valid_entry(entry):
+    """Check that a parsed cache line has the fields we rely on."""
+    return (
+        isinstance(entry, dict)
+        and isinstance(entry.get("hash"), str)
+        and isinstance(entry.get("command"), str)
+        and isinstance(entry.get("ts"), (int, float))
+    )
+
+
+def _load_entries():
+    """Load non-expired cache entries, keyed by prompt hash.
+
+    Returns:
+        tuple: (entries, line_count) where entries is ordered least to most
+        recently used
+    """
+    entries = {}
+    line_count = 0
+    if not CACHE_FILE.exists():
+        return entries, line_count
+
+    cutoff = time.time() - CACHE_TTL
+    try:
+        with open(CACHE_FILE, "r") as f:
+            for line in f:
+                line_count += 1
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Skip partially written or corrupted lines
+                    continue
+                if not _is_valid_entry(entry):
+                    continue
+                if entry["ts"] >= cutoff:
+                    # Later lines win, so re-inserting keeps LRU order
+                    entries.pop(entry["hash"], None)
+                    entries[entry["hash"]] = entry
+    except OSError:
+        return {}, 0
+    return entries, line_count
+
+
+def _write_entries(entries):
+    """Rewrite the cache file, keeping only the most recent entries.
+
+    The new contents go to a temporary file that then replaces the cache,
+    so concurrent readers never see a truncated file.
+    """
+    kept = list(entries.values())[-CACHE_MAX_ENTRIES:]
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CONFIG_DIR, prefix=".cmd_cache.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for entry in kept:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, CACHE_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _append_entry(entry):
+    """Append a single entry to the cache file."""
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_FILE, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def get_cached_command(prompt):
+    """Return the cached command for a prompt, or None on a miss."""
+    entries, line_count = _load_entries()
+    key = _hash_prompt(prompt)
+    entry = entries.pop(key, None)
+    if entry is None:
+        return None
+
+    # Re-append the entry to mark it as recently used; its timestamp is
+    # kept so the TTL still counts from when it was generated
+    entries[key] = entry
+    try:
+        if line_count >= 2 * CACHE_MAX_ENTRIES:
+            _write_entries(entries)
+        else:
+            _append_entry(entry)
+    except OSError:
+        pass
+    return entry["command"]
+
+
+def cache_command(prompt, command):
+    """Store a generated command for a prompt."""
+    entries, line_count = _load_entries()
+    key = _hash_prompt(prompt)
+    entry = {
+        "hash": key,
+        "prompt": prompt,
+        "command": command,
+        "ts": time.time(),
+    }
+    entries.pop(key, None)
+    entries[key] = entry
+    try:
+        if line_count >= 2 * CACHE_MAX_ENTRIES:
+            _write_entries(entries)
+        else:
+            _append_entry(entry)
+    except OSError:
+        # Caching is best effort; never fail the command because of it
+        pass
@@ -1,26 +1,233 @@
 """Main CLI implementation for DoForMe."""
 
-import argparse
-import json
+import contextlib
+import functools
 import os
 import re
-import shutil
-import subprocess
 import sys
-import urllib.request
-import urllib.error
 
 from .config import get_api_key, prompt_for_api_key, set_api_key
+from .daemon import request_command
+
+
+# Pattern to match variations of setting API key
+_SET_KEY_RE = re.compile(
+    r"(?:set|save|update|change)\s+(?:the\s+)?api[\s_]?key\s+(?:to|as)\s+(.+)",
+    re.IGNORECASE
+)
+
+# Markdown code fences the LLM sometimes wraps commands in
+_MD_OPEN = re.compile(r'^```(?:bash|sh)?\n?')
+_MD_CLOSE = re.compile(r'\n?```$')
+
+# Word still being streamed at the end of a partial command
+_PARTIAL_WORD = re.compile(r'\S*$')
+
+# Static system prompt. It must stay byte-for-byte identical between
+# requests (no user input, paths or timestamps) so providers with automatic
+# prompt caching (OpenAI, past 1024 tokens) can serve it from their cache.
+# It is below the 2048-token minimum Anthropic needs to cache a prefix for
+# Haiku models, so no cache_control marker is sent there.
+_SYSTEM_PROMPT = """You are a helpful assistant that converts natural language instructions into CLI commands.
+
+Rules:
+1. Return ONLY the command, nothing else
+2. Do not include explanations or markdown formatting
+3. Do not include backticks or code blocks
+4. Return the exact command that can be executed in a bash shell
+5. If multiple commands are needed, join them with && or ; as appropriate
+6. Use common Unix/Linux tools when possible
+7. Make sure the command is safe and doesn't require sudo unless absolutely necessary
+
+Examples:
+User: "downsize with ffmpeg to max 1024 on each side"
+Assistant: ffmpeg -i input.mp4 -vf "scale='min(1024,iw)':'min(1024,ih)':force_original_aspect_ratio=decrease" output.mp4
+
+User: "find all python files"
+Assistant: find . -name "*.py"
+
+User: "show disk usage"
+Assistant: df -h
+
+User: "find files larger than 100MB"
+Assistant: find . -type f -size +100M
+
+User: "find files modified in the last 24 hours"
+Assistant: find . -type f -mtime -1
+
+User: "delete all .log files recursively"
+Assistant: find . -type f -name "*.log" -delete
+
+User: "search for TODO in all python files"
+Assistant: grep -rn "TODO" --include="*.py" .
+
+User: "count lines of code in all js files"
+Assistant: find . -name "*.js" -type f -exec cat {} + | wc -l
+
+User: "replace foo with bar in all txt files"
+Assistant: sed -i 's/foo/bar/g' *.txt
+
+User: "print the second column of data.csv"
+Assistant: awk -F, '{print $2}' data.csv
+
+User: "sum the numbers in the first column of numbers.txt"
+Assistant: awk '{s+=$1} END {print s}' numbers.txt
+
+User: "show the 10 largest files in this directory"
+Assistant: du -ah . | sort -rh | head -n 10
+
+User: "compress this folder into a tar.gz"
+Assistant: tar -czvf archive.tar.gz .
+
+User: "extract archive.tar.gz"
+Assistant: tar -xzvf archive.tar.gz
+
+User: "zip the docs folder"
+Assistant: zip -r docs.zip docs
+
+User: "list the contents of backup.zip"
+Assistant: unzip -l backup.zip
+
+User: "extract audio from video.mp4"
+Assistant: ffmpeg -i video.mp4 -vn -acodec libmp3lame audio.mp3
+
+User: "convert video.mov to mp4"
+Assistant: ffmpeg -i video.mov -c:v libx264 -c:a aac video.mp4
+
+User: "trim video.mp4 to the first 30 seconds"
+Assistant: ffmpeg -i video.mp4 -t 30 -c copy trimmed.mp4
+
+User: "create a gif from video.mp4"
+Assistant: ffmpeg -i video.mp4 -vf "fps=10,scale=480:-1" output.gif
+
+User: "convert all png images to jpg"
+Assistant: for f in *.png; do convert "$f" "${f%.png}.jpg"; done
+
+User: "list running docker containers"
+Assistant: docker ps
+
+User: "remove all stopped docker containers"
+Assistant: docker container prune -f
+
+User: "open a shell in the web container"
+Assistant: docker exec -it web /bin/sh
+
+User: "show logs of the api container"
+Assistant: docker logs -f api
+
+User: "show git log for the last 5 commits"
+Assistant: git log --oneline -5
+
+User: "undo last commit but keep changes"
+Assistant: git reset --soft HEAD~1
+
+User: "create a new branch called feature"
+Assistant: git checkout -b feature
+
+User: "show what changed in the last commit"
+Assistant: git show --stat HEAD
+
+User: "discard all local changes"
+Assistant: git checkout -- .
+
+User: "show which process is using port 8080"
+Assistant: lsof -i :8080
+
+User: "show memory usage"
+Assistant: free -h
+
+User: "show the top 5 processes by cpu"
+Assistant: ps aux --sort=-%cpu | head -n 6
+
+User: "kill all python processes"
+Assistant: pkill python
+
+User: "download a file from https://example.com/file.txt"
+Assistant: curl -O https://example.com/file.txt
+
+User: "check if google.com is reachable"
+Assistant: ping -c 4 google.com
+
+User: "show my public ip address"
+Assistant: curl -s https://ifconfig.me
+
+User: "make script.sh executable"
+Assistant: chmod +x script.sh
+
+User: "show the last 50 lines of app.log and follow it"
+Assistant: tail -n 50 -f app.log
+
+User: "count unique lines in access.log"
+Assistant: sort access.log | uniq | wc -l
+
+User: "show the 10 most common IPs in access.log"
+Assistant: awk '{print $1}' access.log | sort | uniq -c | sort -rn | head -n 10
+
+User: "pretty print data.json"
+Assistant: python3 -m json.tool data.json
+
+User: "start a web server in this directory"
+Assistant: python3 -m http.server 8000
+
+User: "find duplicate files by checksum"
+Assistant: find . -type f -exec md5sum {} + | sort | uniq -w32 -dD
+
+User: "rename all .jpeg files to .jpg"
+Assistant: for f in *.jpeg; do mv "$f" "${f%.jpeg}.jpg"; done
+
+User: "copy the photos folder to the backup drive"
+Assistant: rsync -av photos/ /mnt/backup/photos/
+
+User: "show environment variables containing PATH"
+Assistant: env | grep PATH
+
+User: "show the current date in ISO format"
+Assistant: date -Iseconds
+
+User: "generate a random password"
+Assistant: openssl rand -base64 16"""
+
+_SYS_MSG = {"role": "system", "content": _SYSTEM_PROMPT}
+
+# Shell operator characters, as grouped by shlex's punctuation_chars
+_PUNCTUATION = "();<>|&"
+
+# Shell keywords and wrappers that are followed by a command
+_SHELL_PREFIX_WORDS = {
+    "if", "then", "else", "elif", "fi", "while", "until", "do", "done",
+    "esac", "{", "}", "!", "time", "sudo",
+}
+
+# Options of prefix words that take a separate argument (sudo -u root ls)
+_PREFIX_OPTION_ARGS = {
+    "sudo": {"-u", "-g", "-h", "-p", "-C", "-D", "-r", "-t", "-T", "-U"},
+    "time": {"-f", "-o"},
+}
+
+# Keywords that are followed by a name or word list rather than a command
+_SHELL_CONTROL_KEYWORDS = {"for", "case", "select", "function"}
+
+# Leading VAR=value assignments before a command
+_ENV_ASSIGNMENT = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*=')
+
+# Characters that need /bin/sh to interpret (operators, expansions, quoting)
+_NEEDS_SHELL = re.compile(r'[&;|<>`$*?()\[\]{}"\'\\~#\n]')
+
+
+def _first_token(command):
+    """Return the first whitespace-delimited word of a command, or ''."""
+    # maxsplit=1 stops after the first word instead of splitting the whole
+    # command line into a list
+    parts = command.split(None, 1)
+    return parts[0] if parts else ""
 
 
 def is_shell_builtin(command):
     """Check if the command is any shell built-in (exists in shell)."""
-    parts = command.strip().split()
-    if not parts:
+    tool = _first_token(command)
+    if not tool:
         return False
 
-    tool = parts[0]
-
     # All common shell built-ins
     all_builtins = [
         "cd", "echo", "export", "set", "source", "alias", "pwd", "pushd", "popd",
@@ -45,12 +252,10 @@ def is_builtin_command(command):
     can be executed normally via subprocess.
     """
     # Extract the first command (tool name)
-    parts = command.strip().split()
-    if not parts:
+    tool = _first_token(command)
+    if not tool:
         return False
 
-    tool = parts[0]
-
     # List of shell built-ins that modify shell state and won't work via subprocess
     state_modifying_builtins = [
         "cd", "export", "set", "source", "alias", "pushd", "popd", "dirs",
@@ -62,45 +267,295 @@ def is_builtin_command(command):
     return tool in state_modifying_builtins
 
 
-def check_tool_exists(command):
-    """Check if the main tool/command exists on the system."""
-    # Extract the first command (tool name)
-    parts = command.strip().split()
-    if not parts:
-        return True
+@functools.lru_cache(maxsize=256)
+def _which(tool, path):
+    """Cached PATH lookup; path is part of the key so PATH changes miss."""
+    import shutil
 
-    tool = parts[0]
+    return shutil.which(tool, path=path)
 
+
+def _command_tools(command):
+    """Yield the tool name of every stage of a shell command line.
+
+    Stages are separated by pipes, &&, ||, ; and & as well as subshells,
+    function bodies, case patterns and command substitutions. Once a
+    substitution closes, parsing resumes where it was, so its output is
+    treated as the argument it is. Shell keywords, sudo/time and their options, and leading
+    environment assignments are skipped. Arithmetic ($((...)), ((...))) and
+    array assignments are not stages, and scanning stops at a heredoc since
+    its body is not shell code.
+    """
+    import shlex
+
+    # Non-POSIX mode keeps quotes on tokens, so a quoted "|" is not
+    # mistaken for a pipe
+    lexer = shlex.shlex(command.replace("\n", " ; "), posix=False, punctuation_chars=True)
+    expect_tool = True
+    found = False
+    previous = ""
+    prefix = None  # sudo/time word whose options are being skipped
+    skip_option_arg = False
+    skip_until = None  # closing token of an arithmetic or array expression
+    escaped = False
+    in_backticks = False
+    in_function_header = False  # between "function NAME"/"NAME()" and "{"
+    before_dollar = ""
+    case_depth = 0
+    case_header = False  # between "case" and "in"
+    in_case_pattern = False  # "a|b)" in a case statement is not a pipeline
+    # One entry per open parenthesis: None for a subshell, otherwise the
+    # parser state to restore when the substitution closes
+    parens = []
+    try:
+        for token in lexer:
+            prior, previous = previous, token
+            if skip_until:
+                if skip_until in token:
+                    skip_until = None
+                continue
+            if escaped:
+                # e.g. the \; ending find -exec is an argument, not a separator
+                escaped = False
+                continue
+            if token == "\\":
+                escaped = True
+                continue
+            if token in ("<<", "<<-"):
+                return
+            if token == "$":
+                # Expansion marker; what follows decides what it is
+                before_dollar = prior
+                continue
+            if token == "{" and prior == "$":
+                # ${parameter} expansion, not a command group
+                skip_until = "}"
+                continue
+            if token == "{" and in_function_header:
+                # Start of a function body
+                in_function_header = False
+                expect_tool = True
+                continue
+            if token == "`":
+                # Opening backtick starts a command, closing one ends it
+                in_backticks = not in_backticks
+                expect_tool = in_backticks
+                prefix = None
+                continue
+            if case_depth and token in (";;", ";&", ";;&"):
+                # The next case pattern follows, not a command
+                expect_tool, prefix, skip_option_arg = False, None, False
+                in_case_pattern = True
+                continue
+            if token == "in" and case_header:
+                case_header = False
+                in_case_pattern = True
+                continue
+            if token == "esac" and case_depth:
+                case_depth -= 1
+                expect_tool = in_case_pattern = False
+                continue
+            if in_case_pattern and all(c in _PUNCTUATION for c in token):
+                if ")" in token:
+                    # End of the pattern; its command follows
+                    in_case_pattern = False
+                    expect_tool = True
+                continue
+            if all(c in _PUNCTUATION for c in token):
+                if "((" in token:
+                    skip_until = "))"
+                    continue
+                if token.startswith("(") and prior.endswith("="):
+                    skip_until = ")"
+                    continue
+                for idx, char in enumerate(token):
+                    if char == "(":
+                        if (idx == 0 and prior == "$") or token[:idx] in ("<", ">"):
+                            # $(...) or <(...); resume here once it closes
+                            assigned = prior == "$" and before_dollar.endswith("=")
+                            parens.append((expect_tool, prefix, skip_option_arg, assigned))
+                        else:
+                            parens.append(None)
+                        expect_tool, prefix, skip_option_arg = True, None, False
+                    elif char == ")" and parens and parens[-1] is not None:
+                        expect_tool, prefix, skip_option_arg, assigned = parens.pop()
+                        if expect_tool and not assigned:
+                            # The substitution stood in for a word: an
+                            # option's argument or the command itself
+                            if skip_option_arg:
+                                skip_option_arg = False
+                            else:
+                                expect_tool, prefix = False, None
+                    elif char == ")":
+                        # Only operators and redirections follow a subshell
+                        if parens:
+                            parens.pop()
+                        expect_tool, prefix, skip_option_arg = False, None, False
+                    elif char in ";|" or (char == "&" and not token[:idx].endswith((">", "<"))):
+                        # Redirections like > or >& do not start a new stage
+                        expect_tool, prefix, skip_option_arg = True, None, False
+                if token == "()":
+                    in_function_header = True
+                continue
+            if not expect_tool:
+                continue
+            if skip_option_arg:
+                skip_option_arg = False
+                continue
+            if prefix and token.startswith("-"):
+                skip_option_arg = token in _PREFIX_OPTION_ARGS.get(prefix, ())
+                continue
+            if token in _SHELL_PREFIX_WORDS or _ENV_ASSIGNMENT.match(token):
+                prefix = token if token in _PREFIX_OPTION_ARGS else None
+                continue
+            if token in _SHELL_CONTROL_KEYWORDS:
+                # for/case/select/function are followed by a name, not a tool
+                expect_tool = False
+                in_function_header = token == "function"
+                if token == "case":
+                    case_depth += 1
+                    case_header = True
+                continue
+            expect_tool = False
+            prefix = None
+            found = True
+            yield token
+    except ValueError:
+        # Unbalanced quotes; fall back to the first word
+        tool = _first_token(command)
+        if tool and not found:
+            yield tool
+
+
+def _tool_available(tool):
+    """Check if a tool is a shell built-in or found in PATH."""
     # Handle shell built-ins - they exist in the shell
-    if is_shell_builtin(command):
+    if is_shell_builtin(tool):
         return True
 
     # Check if tool exists in PATH
-    return shutil.which(tool) is not None
+    return _which(tool, os.environ.get("PATH", "")) is not None
 
 
-def get_command_from_llm(prompt, api_key, provider):
-    """Query LLM to convert natural language to CLI command."""
-    system_prompt = """You are a helpful assistant that converts natural language instructions into CLI commands.
+def find_missing_tools(command):
+    """Return the tools used anywhere in the command that are not installed.
 
-Rules:
-1. Return ONLY the command, nothing else
-2. Do not include explanations or markdown formatting
-3. Do not include backticks or code blocks
-4. Return the exact command that can be executed in a bash shell
-5. If multiple commands are needed, join them with && or ; as appropriate
-6. Use common Unix/Linux tools when possible
-7. Make sure the command is safe and doesn't require sudo unless absolutely necessary
+    Returns:
+        list: Missing tool names, in the order they appear
+    """
+    return [tool for tool in _command_tools(command) if not _tool_available(tool)]
 
-Examples:
-User: "downsize with ffmpeg to max 1024 on each side"
-Assistant: ffmpeg -i input.mp4 -vf "scale='min(1024,iw)':'min(1024,ih)':force_original_aspect_ratio=decrease" output.mp4
 
-User: "find all python files"
-Assistant: find . -name "*.py"
+def check_tool_exists(command):
+    """Check if the main tool/command exists on the system."""
+    tool = next(_command_tools(command), None)
+    return tool is None or _tool_available(tool)
 
-User: "show disk usage"
-Assistant: df -h"""
+
+# Idle keep-alive connections by host, reused by later requests from the
+# same process (e.g. the daemon) to skip the TCP and TLS handshakes
+_IDLE_CONNECTIONS = {}
+
+
+@contextlib.contextmanager
+def _post(url, body, headers):
+    """POST to an HTTPS URL and yield the response.
+
+    Connections are pooled and reused. Errors are raised as
+    urllib.error.HTTPError/URLError, like urllib.request.urlopen.
+    """
+    import http.client
+    import io
+    import urllib.error
+    import urllib.parse
+    import urllib.request
+
+    if urllib.request.getproxies().get("https"):
+        # Only urllib honours proxy settings; don't pool in that case
+        req = urllib.request.Request(url, body, headers)
+        with urllib.request.urlopen(req) as response:
+            yield response
+        return
+
+    parts = urllib.parse.urlsplit(url)
+    idle = _IDLE_CONNECTIONS.setdefault(parts.netloc, [])
+    while True:
+        try:
+            conn = idle.pop()
+            reused = True
+        except IndexError:
+            conn = http.client.HTTPSConnection(parts.netloc, timeout=60)
+            reused = False
+
+        try:
+            conn.request("POST", parts.path, body, headers)
+            response = conn.getresponse()
+            break
+        except (OSError, http.client.HTTPException) as e:
+            conn.close()
+            if not reused:
+                raise urllib.error.URLError(e)
+            # The server closed the idle connection; try the next one
+
+    if response.status >= 400:
+        error_body = response.read()
+        conn.close()
+        raise urllib.error.HTTPError(
+            url, response.status, response.reason, response.headers, io.BytesIO(error_body)
+        )
+
+    try:
+        yield response
+        # Drain the rest of the body so the connection can be reused
+        response.read()
+    except BaseException:
+        conn.close()
+        raise
+
+    if response.will_close:
+        conn.close()
+    else:
+        idle.append(conn)
+
+
+def _iter_stream_deltas(response, provider):
+    """Yield the text deltas of a server-sent events LLM response."""
+    import json
+
+    for raw_line in response:
+        line = raw_line.decode('utf-8').strip()
+        # Skip event names, keep-alive comments and blank separators
+        if not line.startswith("data:"):
+            continue
+        payload = line[len("data:"):].strip()
+        if payload == "[DONE]":
+            break
+
+        event = json.loads(payload)
+        error = event.get("error")
+        if error:
+            message = error.get("message", error) if isinstance(error, dict) else error
+            raise RuntimeError(message)
+
+        if provider == "anthropic":
+            if event.get("type") == "content_block_delta":
+                yield event["delta"].get("text", "")
+        else:
+            choices = event.get("choices")
+            if choices:
+                yield choices[0].get("delta", {}).get("content") or ""
+
+
+def _query_llm(content, api_key, provider, on_chunk=None, max_tokens=500):
+    """Send a user message to the LLM and return its raw reply text.
+
+    The response is streamed; on_chunk, if given, is called with each piece
+    of text as it arrives. Errors are reported on stderr and return None.
+    """
+    # Imported lazily: urllib pulls in http.client, ssl and email, which
+    # would otherwise slow down --help and the set-api-key path
+    import json
+    import urllib.error
 
     try:
         if provider == "openai":
@@ -112,16 +567,13 @@ Assistant: df -h"""
             data = {
                 "model": "gpt-4o-mini",
                 "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
+                    _SYS_MSG,
+                    {"role": "user", "content": content}
                 ],
                 "temperature": 0.3,
-                "max_tokens": 500
+                "max_tokens": max_tokens,
+                "stream": True
             }
-            req = urllib.request.Request(url, json.dumps(data).encode('utf-8'), headers)
-            with urllib.request.urlopen(req) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                command = result['choices'][0]['message']['content'].strip()
 
         elif provider == "anthropic":
             url = "https://api.anthropic.com/v1/messages"
@@ -132,17 +584,14 @@ Assistant: df -h"""
             }
             data = {
                 "model": "claude-3-5-haiku-20241022",
-                "max_tokens": 500,
+                "max_tokens": max_tokens,
                 "temperature": 0.3,
-                "system": system_prompt,
+                "stream": True,
+                "system": _SYSTEM_PROMPT,
                 "messages": [
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": content}
                 ]
             }
-            req = urllib.request.Request(url, json.dumps(data).encode('utf-8'), headers)
-            with urllib.request.urlopen(req) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                command = result['content'][0]['text'].strip()
 
         elif provider == "groq":
             url = "https://api.groq.com/openai/v1/chat/completions"
@@ -153,16 +602,13 @@ Assistant: df -h"""
             data = {
                 "model": "llama-3.3-70b-versatile",
                 "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
+                    _SYS_MSG,
+                    {"role": "user", "content": content}
                 ],
                 "temperature": 0.3,
-                "max_tokens": 500
+                "max_tokens": max_tokens,
+                "stream": True
             }
-            req = urllib.request.Request(url, json.dumps(data).encode('utf-8'), headers)
-            with urllib.request.urlopen(req) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                command = result['choices'][0]['message']['content'].strip()
 
         elif provider == "openrouter":
             url = "https://openrouter.ai/api/v1/chat/completions"
@@ -173,25 +619,28 @@ Assistant: df -h"""
             data = {
                 "model": "anthropic/claude-3.5-haiku",
                 "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
+                    _SYS_MSG,
+                    {"role": "user", "content": content}
                 ],
                 "temperature": 0.3,
-                "max_tokens": 500
+                "max_tokens": max_tokens,
+                "stream": True
             }
-            req = urllib.request.Request(url, json.dumps(data).encode('utf-8'), headers)
-            with urllib.request.urlopen(req) as response:
-                result = json.loads(response.read().decode('utf-8'))
-                command = result['choices'][0]['message']['content'].strip()
 
         else:
             print(f"❌ Unsupported provider: {provider}", file=sys.stderr)
             return None
 
-        # Remove any markdown code blocks if present
-        command = re.sub(r'^```(?:bash|sh)?\n?', '', command)
-        command = re.sub(r'\n?```$', '', command)
-        return command.strip()
+        # Stream the response so the caller can show it as it arrives
+        chunks = []
+        with _post(url, json.dumps(data).encode('utf-8'), headers) as response:
+            for delta in _iter_stream_deltas(response, provider):
+                if not delta:
+                    continue
+                chunks.append(delta)
+                if on_chunk:
+                    on_chunk(delta)
+        return "".join(chunks).strip()
 
     except urllib.error.HTTPError as e:
         error_body = e.read().decode('utf-8') if e.fp else ''
@@ -215,39 +664,213 @@ Assistant: df -h"""
         return None
 
 
+def _clean_command(text):
+    """Strip markdown code fences and surrounding whitespace from a reply."""
+    command = _MD_OPEN.sub('', text.strip())
+    command = _MD_CLOSE.sub('', command)
+    return command.strip()
+
+
+def get_command_from_llm(prompt, api_key, provider, use_cache=True, on_chunk=None):
+    """Query LLM to convert natural language to CLI command.
+
+    Previously generated commands are served from the on-disk cache unless
+    use_cache is False; fresh results are always stored, so --no-cache
+    replaces a bad cached answer. The response is streamed; on_chunk, if
+    given, is called with each piece of text as it arrives (not for cache
+    hits).
+    """
+    from .cache import cache_command, get_cached_command
+
+    if use_cache:
+        command = get_cached_command(prompt)
+        if command:
+            return command
+
+    text = _query_llm(prompt, api_key, provider, on_chunk=on_chunk)
+    if text is None:
+        return None
+
+    # Remove any markdown code blocks if present
+    command = _clean_command(text)
+    if command:
+        cache_command(prompt, command)
+    return command
+
+
+class _StreamPrinter:
+    """Echo a streamed command and look up its tool as soon as it is known."""
+
+    def __init__(self):
+        self.chunks = []
+        self.tool_checked = False
+
+    def __call__(self, delta):
+        if not self.chunks:
+            sys.stdout.write("\n📋 Command: ")
+        self.chunks.append(delta)
+        sys.stdout.write(delta)
+        sys.stdout.flush()
+
+        # Look up the tool check_tool_exists() will check once its name is
+        # complete, while the rest of the command is still arriving; the
+        # result stays in the _which cache for the check afterwards. Only
+        # words followed by whitespace are parsed, so a partial name is never
+        # looked up. Fenced output is checked after cleanup.
+        if not self.tool_checked:
+            text = "".join(self.chunks).lstrip()
+            if text and not text.startswith("`"):
+                tool = next(_command_tools(_PARTIAL_WORD.sub("", text)), None)
+                if tool:
+                    _tool_available(tool)
+                    self.tool_checked = True
+
+    @property
+    def text(self):
+        return "".join(self.chunks).strip()
+
+
 def handle_set_api_key(prompt):
     """Check if the prompt is asking to set the API key."""
     from .config import prompt_for_provider, PROVIDERS
 
-    # Pattern to match variations of setting API key
-    patterns = [
-        r"set (?:the )?api[ _]?key to (.+)",
-        r"save (?:the )?api[ _]?key as (.+)",
-        r"update (?:the )?api[ _]?key to (.+)",
-        r"change (?:the )?api[ _]?key to (.+)",
-    ]
+    # Match case-insensitively instead of lowering the prompt, so the key
+    # keeps its original case
+    match = _SET_KEY_RE.search(prompt)
+    if not match:
+        return False
 
-    for pattern in patterns:
-        match = re.search(pattern, prompt.lower())
-        if match:
-            api_key = match.group(1).strip()
+    api_key = match.group(1).strip()
 
-            # Prompt for provider
-            provider = prompt_for_provider()
-            if not provider:
-                print("❌ No provider selected")
-                return True
+    # Prompt for provider
+    provider = prompt_for_provider()
+    if not provider:
+        print("❌ No provider selected")
+        return True
 
-            set_api_key(api_key, provider)
-            provider_name = PROVIDERS[provider]["name"]
-            print(f"✓ {provider_name} API key updated successfully")
-            return True
+    set_api_key(api_key, provider)
+    provider_name = PROVIDERS[provider]["name"]
+    print(f"✓ {provider_name} API key updated successfully")
+    return True
 
-    return False
 
+def _direct_argv(command):
+    """Return the argv to run a command without a shell, or None if it needs one.
+
+    Without quotes, escapes or other metacharacters in the command,
+    splitting on whitespace matches what the shell would do.
+    """
+    if not hasattr(os, "posix_spawnp"):
+        return None
+    if _NEEDS_SHELL.search(command) or is_shell_builtin(command):
+        return None
+    argv = command.split()
+    if not argv or "=" in argv[0]:
+        # Leading VAR=value assignments are handled by the shell
+        return None
+    return argv
+
+
+def _spawn(argv):
+    """Run argv without a shell and return its exit code.
+
+    posix_spawnp does a single PATH lookup and, unlike fork(), does not
+    copy this process's page tables. Returns None if the command could not
+    be started, so the caller can let the shell run and report it. Once the
+    child exists, errors are raised rather than retried: the command must
+    never run twice.
+    """
+    import signal
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        # Python ignores SIGPIPE and SIGXFSZ; give the child the defaults back,
+        # as subprocess does with restore_signals, so e.g. seq | head ends
+        # quietly instead of reporting a write error
+        pid = os.posix_spawnp(
+            argv[0], argv, os.environ, setsigdef=(signal.SIGPIPE, signal.SIGXFSZ)
+        )
+    except OSError:
+        # e.g. not found or not executable
+        return None
+
+    try:
+        _, status = os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        # The child got the same SIGINT; reap it before reporting
+        try:
+            os.waitpid(pid, 0)
+        except ChildProcessError:
+            pass
+        raise
+
+    if os.WIFSIGNALED(status):
+        # Same convention as the shell for commands killed by a signal
+        return 128 + os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _confirm(question):
+    """Ask a yes/no question that defaults to yes.
+
+    On a terminal a single keypress answers it; otherwise, or where termios
+    is unavailable, a line is read with input().
+    """
+    if sys.stdin.isatty():
+        try:
+            import termios
+            import tty
+        except ImportError:
+            pass
+        else:
+            sys.stdout.write(question)
+            sys.stdout.flush()
+            fd = sys.stdin.fileno()
+            old_settings = termios.tcgetattr(fd)
+            try:
+                tty.setcbreak(fd)
+                answer = sys.stdin.read(1).lower()
+            finally:
+                termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+            print(answer.strip())
+            return answer in ("y", "\r", "\n")
+
+    response = input(question).strip().lower()
+    return not response or response in ["y", "yes"]
+
+
+def _fast_parse(argv):
+    """Parse the common invocation without building an argparse parser.
+
+    Returns:
+        tuple: (prompt_words, dry_run, yes, no_cache), or None if the
+        arguments need the full parser (help, unknown flags, no prompt)
+    """
+    prompt_words = []
+    dry_run = yes = no_cache = False
+
+    for arg in argv:
+        if arg == "--dry-run":
+            dry_run = True
+        elif arg in ("--yes", "-y"):
+            yes = True
+        elif arg == "--no-cache":
+            no_cache = True
+        elif arg.startswith("-"):
+            return None
+        else:
+            prompt_words.append(arg)
+
+    if not prompt_words:
+        return None
+    return prompt_words, dry_run, yes, no_cache
+
+
+def _build_parser():
+    """Build the full argparse parser, used for --help and unusual input."""
+    import argparse
 
-def main():
-    """Main entry point for the CLI."""
     parser = argparse.ArgumentParser(
         description="DoForMe - Execute CLI commands using natural language",
         usage="doforme \"<your natural language command>\""
@@ -267,34 +890,69 @@ def main():
         action="store_true",
         help="Skip confirmation and execute immediately"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Query the LLM even if a cached command exists, and cache the new result"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run a background server that batches prompts from concurrent invocations"
+    )
+    return parser
 
-    args = parser.parse_args()
 
-    if not args.prompt:
-        parser.print_help()
-        return 1
+def main():
+    """Main entry point for the CLI."""
+    parsed = _fast_parse(sys.argv[1:])
+    if parsed is None:
+        parser = _build_parser()
+        args = parser.parse_args()
+
+        if args.daemon:
+            from .daemon import serve
+            return serve()
+
+        if not args.prompt:
+            parser.print_help()
+            return 1
+
+        parsed = args.prompt, args.dry_run, args.yes, args.no_cache
 
-    prompt = " ".join(args.prompt)
+    prompt_words, dry_run, yes, no_cache = parsed
+    prompt = " ".join(prompt_words)
 
     # Special case: setting API key
     if handle_set_api_key(prompt):
         return 0
 
-    # Get API key and provider
-    api_key, provider = get_api_key()
-    if not api_key:
-        api_key, provider = prompt_for_api_key()
-        if not api_key:
-            return 1
-
     print(f"🤔 Thinking about: {prompt}")
 
-    # Get command from LLM
-    command = get_command_from_llm(prompt, api_key, provider)
+    printer = _StreamPrinter()
+    try:
+        # A running daemon batches prompts from concurrent invocations
+        command = request_command(prompt, use_cache=not no_cache)
+    except OSError:
+        # No daemon; get API key and provider and query the LLM directly
+        api_key, provider = get_api_key()
+        if not api_key:
+            api_key, provider = prompt_for_api_key()
+            if not api_key:
+                return 1
+
+        # Get command from LLM, echoing it as it streams in
+        command = get_command_from_llm(
+            prompt, api_key, provider, use_cache=not no_cache, on_chunk=printer
+        )
+    if printer.chunks:
+        print()
     if not command:
         return 1
 
-    print(f"\n📋 Command: {command}")
+    if command != printer.text:
+        # Cache hit, or the streamed text needed cleaning up
+        print(f"\n📋 Command: {command}")
 
     # Check if it's a state-modifying shell built-in command
     if is_builtin_command(command):
@@ -303,27 +961,38 @@ def main():
         print(f"\n   {command}\n")
         return 0
 
-    # Check if required tool exists
+    # Check if the main tool exists; only it blocks execution
     if not check_tool_exists(command):
-        tool = command.strip().split()[0]
+        tool = next(_command_tools(command))
         print(f"\n❌ Error: Required tool '{tool}' is not installed on your system.")
         print(f"   Please install it and try again.")
         return 1
 
+    # Other stages are parsed heuristically, so only warn about them
+    missing = find_missing_tools(command)
+    if missing:
+        print(f"\n⚠️  Warning: {', '.join(repr(t) for t in missing)} not found on your system.")
+
     # Ask for confirmation unless --yes or --dry-run
-    if args.dry_run:
+    if dry_run:
         print("\n🏃 Dry run mode - not executing")
         return 0
 
-    if not args.yes:
-        response = input("\n▶️  Execute this command? [Y/n]: ").strip().lower()
-        if response and response not in ["y", "yes"]:
-            print("❌ Cancelled")
-            return 0
+    if not yes and not _confirm("\n▶️  Execute this command? [Y/n]: "):
+        print("❌ Cancelled")
+        return 0
 
     # Execute the command
     print()
+    argv = _direct_argv(command)
     try:
+        if argv is not None:
+            code = _spawn(argv)
+            if code is not None:
+                return code
+
+        import subprocess
+
         result = subprocess.run(
             command,
             shell=True,
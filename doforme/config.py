@@ -1,6 +1,5 @@
 """Configuration management for DoForMe."""
 
-import json
 import os
 from pathlib import Path
 
@@ -33,24 +32,89 @@ PROVIDERS = {
 }
 
 
+# (loads, dumps) pair used for the config file, picked on first use
+_SERIALIZER = None
+
+
+def _serializer():
+    """Return the JSON (loads, dumps) functions, using orjson when available."""
+    global _SERIALIZER
+
+    # orjson is optional and imported on first use: its own imports (uuid,
+    # datetime, zoneinfo) cost more than the parse on paths that never read
+    # the config file, such as when the API key comes from the environment.
+    # The choice is kept because Python does not cache a failed import, so
+    # each attempt would search sys.path again.
+    if _SERIALIZER is None:
+        try:
+            import orjson
+        except ImportError:
+            import json
+            _SERIALIZER = (
+                json.loads,
+                lambda obj: json.dumps(obj, indent=2).encode("utf-8"),
+            )
+        else:
+            _SERIALIZER = (
+                orjson.loads,
+                lambda obj: orjson.dumps(obj, option=orjson.OPT_INDENT_2),
+            )
+    return _SERIALIZER
+
+
+def _loads(data):
+    """Parse JSON bytes, using orjson when available."""
+    return _serializer()[0](data)
+
+
+def _dumps(obj):
+    """Serialize to indented JSON bytes, using orjson when available."""
+    return _serializer()[1](obj)
+
+
+# Parsed config file, reused while the file's mtime is unchanged
+_CACHED = None
+_CACHED_MTIME = 0
+
+
 def load_config():
     """Load configuration from file."""
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, Exception):
-            # If config is corrupted or old format, return empty dict
-            return {}
-    return {}
+    global _CACHED, _CACHED_MTIME
+
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        # Missing or unreadable config file
+        return {}
+
+    if _CACHED is not None and mtime == _CACHED_MTIME:
+        return _CACHED
+
+    try:
+        config = _loads(CONFIG_FILE.read_bytes())
+    except Exception:
+        # If config is corrupted or old format, return empty dict
+        config = {}
+
+    _CACHED, _CACHED_MTIME = config, mtime
+    return config
 
 
 def save_config(config):
     """Save configuration to file."""
+    global _CACHED_MTIME
+
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=2)
-    os.chmod(CONFIG_FILE, 0o600)  # Secure the file
+    # Create the file as owner-only from the start, rather than chmod-ing it
+    # afterwards and leaving a window where it has default permissions. The
+    # mode only applies to new files, so also tighten an existing one through
+    # the same descriptor before the key is written.
+    fd = os.open(CONFIG_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(_dumps(config))
+    # Force the next load_config() to re-read the file
+    _CACHED_MTIME = 0
 
 
 def get_api_key():
@@ -59,16 +123,15 @@ def get_api_key():
     Returns:
         tuple: (api_key, provider) or (None, None) if not found
     """
-    config = load_config()
-    provider = config.get("provider")
-
     # First check environment variables for each provider
     for prov_id, prov_info in PROVIDERS.items():
         api_key = os.environ.get(prov_info["env_var"])
         if api_key:
             return api_key, prov_id
 
-    # Then check config file
+    # Then check config file, which is only read if no variable is set
+    config = load_config()
+    provider = config.get("provider")
     if provider and "api_key" in config:
         return config["api_key"], provider
 
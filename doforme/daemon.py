@@ -0,0 +1,246 @@
+"""Background daemon that batches prompts into shared LLM requests.
+
+Start it with ``doforme --daemon``. While it is running, ``doforme``
+invocations hand their prompt to it over a Unix socket instead of querying
+the LLM themselves. Prompts arriving within a short window are answered by
+a single request to the provider.
+"""
+
+import os
+import re
+import sys
+
+from .config import CONFIG_DIR
+
+
+SOCKET_PATH = CONFIG_DIR / "sock"
+
+# How long to wait for more prompts before sending a batch, in seconds
+BATCH_WINDOW = 0.25
+# Maximum number of prompts answered by one LLM request
+BATCH_MAX = 8
+# How long a client waits for the daemon before querying the LLM itself
+CLIENT_TIMEOUT = 60
+
+_BATCH_SEPARATOR = "---"
+_SEPARATOR_RE = re.compile(r'^\s*-{3,}\s*$', re.MULTILINE)
+_NUMBERING_RE = re.compile(r'^\s*\d+[.)]\s+')
+
+
+def request_command(prompt, use_cache=True):
+    """Ask a running daemon to convert a prompt into a command.
+
+    Returns:
+        str: The command, or None if the daemon could not generate one
+
+    Raises:
+        OSError: If no daemon is reachable
+    """
+    if not SOCKET_PATH.exists():
+        raise FileNotFoundError(f"No doforme daemon socket at {SOCKET_PATH}")
+
+    import json
+    import socket
+
+    request = json.dumps({"prompt": prompt, "use_cache": use_cache})
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        sock.connect(str(SOCKET_PATH))
+        sock.sendall(request.encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+
+    if not line:
+        raise ConnectionError("The doforme daemon closed the connection")
+
+    try:
+        response = json.loads(line)
+    except ValueError:
+        response = None
+    if not isinstance(response, dict):
+        raise ConnectionError("The doforme daemon sent an invalid response")
+    if response.get("error"):
+        print(f"❌ {response['error']}", file=sys.stderr)
+        return None
+    return response.get("command")
+
+
+def _is_running():
+    """Check whether a daemon is accepting connections on the socket."""
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(SOCKET_PATH))
+        except OSError:
+            return False
+    return True
+
+
+def _batch_message(prompts):
+    """Build the user message asking for one command per prompt."""
+    lines = [
+        "Convert each of the following numbered requests into a command.",
+        "Return exactly one command per request, in the same order, without",
+        f"numbering, separated by lines containing only {_BATCH_SEPARATOR}",
+        "",
+    ]
+    lines.extend(f"{idx}. {prompt}" for idx, prompt in enumerate(prompts, 1))
+    return "\n".join(lines)
+
+
+def get_commands(prompts, api_key, provider):
+    """Convert several prompts into commands with a single LLM request.
+
+    Every command generated is cached, including for prompts sent with
+    use_cache off, the same as get_command_from_llm does.
+
+    Returns:
+        list: One command (or None on failure) per prompt, in order
+    """
+    from .cache import cache_command
+    from .cli import _clean_command, _query_llm, get_command_from_llm
+
+    if len(prompts) == 1:
+        return [get_command_from_llm(prompts[0], api_key, provider, use_cache=False)]
+
+    text = _query_llm(
+        _batch_message(prompts), api_key, provider, max_tokens=500 * len(prompts)
+    )
+    if text is None:
+        return [None] * len(prompts)
+
+    commands = [
+        _clean_command(_NUMBERING_RE.sub('', part))
+        for part in _SEPARATOR_RE.split(text)
+        if part.strip()
+    ]
+    if len(commands) != len(prompts):
+        # The reply could not be matched up; ask for each prompt separately
+        return [
+            get_command_from_llm(prompt, api_key, provider, use_cache=False)
+            for prompt in prompts
+        ]
+
+    for prompt, command in zip(prompts, commands):
+        if command:
+            cache_command(prompt, command)
+    return commands
+
+
+async def _serve(api_key, provider):
+    """Accept prompts on the socket and answer them in batches."""
+    import asyncio
+    import json
+
+    from .cache import get_cached_command
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    running = set()
+
+    async def dispatch(batch):
+        prompts = [prompt for prompt, _ in batch]
+        try:
+            commands = await loop.run_in_executor(
+                None, get_commands, prompts, api_key, provider
+            )
+        except Exception as e:
+            print(f"❌ Error answering batch: {e}", file=sys.stderr)
+            commands = [None] * len(batch)
+        for (_, future), command in zip(batch, commands):
+            if not future.done():
+                future.set_result(command)
+
+    async def collect():
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + BATCH_WINDOW
+            while len(batch) < BATCH_MAX:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Keep collecting the next batch while this one is answered
+            task = asyncio.ensure_future(dispatch(batch))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+    async def handle(reader, writer):
+        try:
+            request = json.loads(await reader.readline())
+            prompt = request["prompt"].strip()
+            if not prompt:
+                raise ValueError("empty prompt")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            response = {"error": "Invalid request sent to the doforme daemon"}
+        else:
+            command = get_cached_command(prompt) if request.get("use_cache", True) else None
+            if not command:
+                future = loop.create_future()
+                await queue.put((prompt, future))
+                command = await future
+
+            if command:
+                response = {"command": command}
+            else:
+                response = {"error": "The doforme daemon could not generate a command"}
+
+        try:
+            writer.write(json.dumps(response).encode("utf-8") + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            # The client gave up waiting
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(handle, path=str(SOCKET_PATH))
+    os.chmod(SOCKET_PATH, 0o600)  # Only the owner may use our API key
+    collector = asyncio.ensure_future(collect())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        collector.cancel()
+
+
+def serve():
+    """Run the daemon in the foreground until interrupted."""
+    import asyncio
+    import signal
+
+    from .config import get_api_key, prompt_for_api_key
+
+    api_key, provider = get_api_key()
+    if not api_key:
+        api_key, provider = prompt_for_api_key()
+        if not api_key:
+            return 1
+
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+    if SOCKET_PATH.exists():
+        if _is_running():
+            print(f"❌ A doforme daemon is already running on {SOCKET_PATH}", file=sys.stderr)
+            return 1
+        # Left behind by a daemon that did not shut down cleanly
+        SOCKET_PATH.unlink()
+
+    # Exit through the cleanup below when stopped with kill/SIGTERM too
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    print(f"🚀 doforme daemon listening on {SOCKET_PATH} (Ctrl+C to stop)")
+    try:
+        asyncio.run(_serve(api_key, provider))
+    except KeyboardInterrupt:
+        print("\n👋 doforme daemon stopped")
+    finally:
+        try:
+            SOCKET_PATH.unlink()
+        except FileNotFoundError:
+            pass
+    return 0
@@ -0,0 +1,12 @@
+import pytest
+
+from doforme import cache
+
+
+@pytest.fixture
+def cache_file(monkeypatch, tmp_path):
+    """Point the command cache at a fresh file in a temporary directory."""
+    path = tmp_path / "cmd_cache.jsonl"
+    monkeypatch.setattr(cache, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(cache, "CACHE_FILE", path)
+    return path
@@ -0,0 +1,68 @@
+"""Tests for the on-disk command cache in doforme.cache."""
+
+import json
+import time
+
+from doforme import cache
+
+
+def _lines(path):
+    return path.read_text().splitlines()
+
+
+def test_roundtrip_normalizes_whitespace_but_keeps_case(cache_file):
+    cache.cache_command("list   files\n", "ls")
+    assert cache.get_cached_command(" list files") == "ls"
+    assert cache.get_cached_command("List files") is None
+
+
+def test_miss_appends_a_single_line(cache_file):
+    cache.cache_command("a", "ls")
+    cache.cache_command("b", "pwd")
+    cache.cache_command("a", "ls -la")
+    assert len(_lines(cache_file)) == 3
+    assert cache.get_cached_command("a") == "ls -la"
+
+
+def test_expired_entries_are_ignored(cache_file):
+    entry = {
+        "hash": cache._hash_prompt("old"),
+        "prompt": "old",
+        "command": "ls",
+        "ts": time.time() - cache.CACHE_TTL - 1,
+    }
+    cache_file.write_text(json.dumps(entry) + "\n")
+    assert cache.get_cached_command("old") is None
+
+
+def test_hit_keeps_original_timestamp(cache_file):
+    cache.cache_command("a", "ls")
+    ts = json.loads(_lines(cache_file)[0])["ts"]
+    cache.get_cached_command("a")
+    assert json.loads(_lines(cache_file)[-1])["ts"] == ts
+
+
+def test_bad_lines_are_skipped(cache_file):
+    cache.cache_command("a", "ls")
+    with open(cache_file, "a") as f:
+        f.write('garbage\n[]\n{"hash": 1}\n{"hash": "x", "command": "ls"}\n{"trunc')
+    assert cache.get_cached_command("a") == "ls"
+    assert cache.get_cached_command("b") is None
+
+
+def test_compaction_evicts_least_recently_used(cache_file, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_MAX_ENTRIES", 3)
+    for prompt in "abcde":
+        cache.cache_command(prompt, f"echo {prompt}")
+    # Touching "a" makes it the most recently used entry (6 lines now)
+    assert cache.get_cached_command("a") == "echo a"
+    assert len(_lines(cache_file)) == 6
+
+    # Reaching 2 * CACHE_MAX_ENTRIES lines rewrites the file
+    cache.cache_command("f", "echo f")
+    assert len(_lines(cache_file)) == 3
+    assert [cache.get_cached_command(p) for p in "abcdef"] == [
+        "echo a", None, None, None, "echo e", "echo f"
+    ]
+    # The rewrite goes through a temporary file that must not be left behind
+    assert sorted(p.name for p in cache_file.parent.iterdir()) == [cache_file.name]
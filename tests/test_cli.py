@@ -0,0 +1,137 @@
+"""Tests for the command line parsing helpers in doforme.cli."""
+
+import os
+import signal
+
+import pytest
+
+from doforme import cli
+
+
+@pytest.fixture
+def generated_command(monkeypatch):
+    """Make main() skip the daemon and get the given command from the LLM.
+
+    Every tool except "nosuchtool" counts as installed; the flag passed
+    along with the command is given to main() before the prompt.
+    """
+    def no_daemon(prompt, use_cache=True):
+        raise FileNotFoundError
+
+    def use(command, flag="--dry-run"):
+        monkeypatch.setattr(cli, "request_command", no_daemon)
+        monkeypatch.setattr(cli, "get_api_key", lambda: ("key", "openai"))
+        monkeypatch.setattr(cli, "get_command_from_llm", lambda *args, **kwargs: command)
+        monkeypatch.setattr(cli, "_tool_available", lambda tool: tool != "nosuchtool")
+        monkeypatch.setattr("sys.argv", ["doforme", flag, "do", "it"])
+
+    return use
+
+
+@pytest.mark.parametrize("command, tools", [
+    ("ls -la", ["ls"]),
+    ("", []),
+    ("ls | grep foo && wc -l; echo done", ["ls", "grep", "wc", "echo"]),
+    ("git log --oneline -5 || true", ["git", "true"]),
+    ("sleep 10 & ls", ["sleep", "ls"]),
+    ('tr "|" "," < in.txt > out.txt 2>&1', ["tr"]),
+    ("awk '{print $1}' access.log | sort | uniq -c | sort -rn | head -n 10",
+     ["awk", "sort", "uniq", "sort", "head"]),
+    ("FOO=1 BAR=2 make", ["make"]),
+    ("(cd build && make) &", ["cd", "make"]),
+    ("echo $(date) | sudo tee out.txt", ["echo", "date", "tee"]),
+    ("echo `date` foo | wc -l", ["echo", "date", "wc"]),
+    ("x=$(date)", ["date"]),
+    ("echo ${HOME}/bin", ["echo"]),
+    ('for f in *.png; do convert "$f" "${f%.png}.jpg"; done', ["convert"]),
+    ("if [ -f x ]; then cat x; else echo no; fi", ["[", "cat", "echo"]),
+    ("find . -type f -exec md5sum {} + | sort | uniq -w32 -dD", ["find", "sort", "uniq"]),
+    ("find . -name x -exec echo {} \\; -print", ["find"]),
+    ("cat <<EOF\nhello\nEOF", ["cat"]),
+    ('cat <<< "hi" | wc -c', ["cat", "wc"]),
+    ("sudo -u root ls", ["ls"]),
+    ("sudo -E make install", ["make"]),
+    ("time -p ls", ["ls"]),
+    ("echo $((1+2))", ["echo"]),
+    ("((i++)); ls", ["ls"]),
+    ("arr=(a b c)", []),
+    ("echo a \\| wc", ["echo"]),
+    ("tar -czf backup-$(date +%F).tar.gz src/", ["tar", "date"]),
+    ("ls $(pwd) -la", ["ls", "pwd"]),
+    ("echo $(whoami) is logged in", ["echo", "whoami"]),
+    ("echo $(echo $(date) foo) bar", ["echo", "echo", "date"]),
+    ("x=$(date) make", ["date", "make"]),
+    ("$(which python) -V", ["which"]),
+    ("sudo -u $(whoami) ls", ["whoami", "ls"]),
+    ("diff <(sort a) <(sort b)", ["diff", "sort", "sort"]),
+    ("function foo { ls; }", ["ls"]),
+    ("case $(uname) in Linux|Darwin) ls ;; *) pwd ;; esac; wc", ["uname", "ls", "pwd", "wc"]),
+    ('git commit -m "unterminated', ["git"]),
+])
+def test_command_tools(command, tools):
+    assert list(cli._command_tools(command)) == tools
+
+
+def test_check_tool_exists_only_checks_main_tool(monkeypatch):
+    monkeypatch.setattr(cli, "_tool_available", lambda tool: tool != "nosuchtool")
+    assert cli.check_tool_exists("ls | nosuchtool")
+    assert not cli.check_tool_exists("nosuchtool | ls")
+    assert cli.find_missing_tools("ls | nosuchtool") == ["nosuchtool"]
+
+
+@pytest.mark.parametrize("command", [
+    "find . -name x -exec echo {} \\; -print",
+    "cat <<EOF\nhello\nEOF",
+    "sudo -u root ls",
+    "echo $((1+2))",
+    "ls | nosuchtool",
+])
+def test_main_runs_commands_whose_main_tool_exists(generated_command, command):
+    generated_command(command)
+    assert cli.main() == 0
+
+
+def test_main_blocks_missing_main_tool(generated_command):
+    generated_command("nosuchtool -x")
+    assert cli.main() == 1
+
+
+def test_spawn_reports_commands_that_cannot_start():
+    assert cli._spawn(["/nonexistent/doforme-test"]) is None
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc")
+def test_spawn_restores_default_signal_handling(capfd):
+    assert cli._spawn(["grep", "SigIgn", "/proc/self/status"]) == 0
+    ignored = int(capfd.readouterr().out.split()[1], 16)
+    for signum in (signal.SIGPIPE, signal.SIGXFSZ):
+        assert not ignored & (1 << (signum - 1))
+
+
+def test_main_does_not_rerun_command_when_wait_fails(monkeypatch, tmp_path, generated_command):
+    marker = tmp_path / "ran"
+
+    def failing_waitpid(pid, options):
+        real_waitpid(pid, options)
+        raise ChildProcessError(10, "No child processes")
+
+    real_waitpid = cli.os.waitpid
+    generated_command(f"touch {marker}", "--yes")
+    monkeypatch.setattr(cli.os, "waitpid", failing_waitpid)
+    monkeypatch.setattr("subprocess.run", lambda *args, **kwargs: pytest.fail("command ran twice"))
+    assert cli.main() == 1
+    assert marker.exists()
+
+
+@pytest.mark.parametrize("command, tool", [
+    ("sudo apt-get install -y jq", "apt-get"),
+    ("FOO=1 make all", "make"),
+    ("ls -la", "ls"),
+])
+def test_stream_printer_looks_up_checked_tool(monkeypatch, capsys, command, tool):
+    looked_up = []
+    monkeypatch.setattr(cli, "_tool_available", looked_up.append)
+    printer = cli._StreamPrinter()
+    for start in range(0, len(command), 3):
+        printer(command[start:start + 3])
+    assert looked_up == [tool] == [next(cli._command_tools(command))]
@@ -0,0 +1,48 @@
+"""Tests for reading and writing the config file in doforme.config."""
+
+import stat
+
+import pytest
+
+from doforme import config
+
+
+@pytest.fixture
+def config_file(monkeypatch, tmp_path):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(config, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(config, "CONFIG_FILE", path)
+    monkeypatch.setattr(config, "_CACHED", None)
+    return path
+
+
+def test_save_creates_owner_only_file(config_file):
+    config.set_api_key("sk-test", "openai")
+    assert stat.S_IMODE(config_file.stat().st_mode) == 0o600
+    assert config.load_config() == {"api_key": "sk-test", "provider": "openai"}
+
+
+def test_save_tightens_existing_world_readable_file(config_file):
+    config_file.write_text("{}")
+    config_file.chmod(0o644)
+    config.set_api_key("sk-test", "openai")
+    assert stat.S_IMODE(config_file.stat().st_mode) == 0o600
+
+
+def test_serializer_import_is_attempted_once(monkeypatch):
+    import builtins
+
+    attempts = []
+    real_import = builtins.__import__
+
+    def import_without_orjson(name, *args, **kwargs):
+        if name == "orjson":
+            attempts.append(name)
+            raise ImportError(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(config, "_SERIALIZER", None)
+    monkeypatch.setattr(builtins, "__import__", import_without_orjson)
+    assert config._loads(config._dumps({"a": 1})) == {"a": 1}
+    assert config._loads(b"[]") == []
+    assert attempts == ["orjson"]
@@ -0,0 +1,131 @@
+"""Tests for prompt batching and the client side of doforme.daemon."""
+
+import asyncio
+import socket
+import threading
+import time
+
+import pytest
+
+from doforme import cache, cli, daemon
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Stub the LLM; set .batch_reply to choose the answer to batch requests."""
+    class FakeLLM:
+        batch_reply = None
+
+        def __init__(self):
+            self.requests = []
+
+        def __call__(self, content, api_key, provider, on_chunk=None, max_tokens=500):
+            self.requests.append(content)
+            if content.startswith("Convert each"):
+                return self.batch_reply
+            return f"echo {content}"
+
+    fake = FakeLLM()
+    monkeypatch.setattr(cli, "_query_llm", fake)
+    return fake
+
+
+@pytest.fixture
+def socket_path(monkeypatch, tmp_path):
+    path = tmp_path / "sock"
+    monkeypatch.setattr(daemon, "SOCKET_PATH", path)
+    return path
+
+
+def test_batch_with_matching_count(cache_file, llm):
+    llm.batch_reply = "1. ls -la\n---\n```bash\npwd\n```\n---\n3) df -h"
+    assert daemon.get_commands(["list", "where", "disk"], "key", "openai") == [
+        "ls -la", "pwd", "df -h"
+    ]
+    assert len(llm.requests) == 1
+    assert cache.get_cached_command("where") == "pwd"
+
+
+def test_batch_with_wrong_count_asks_each_prompt(cache_file, llm):
+    llm.batch_reply = "ls -la\n---\npwd"
+    assert daemon.get_commands(["a", "b", "c"], "key", "openai") == [
+        "echo a", "echo b", "echo c"
+    ]
+    assert llm.requests[1:] == ["a", "b", "c"]
+    assert cache.get_cached_command("c") == "echo c"
+
+
+def test_failed_batch_returns_none_for_each_prompt(cache_file, llm):
+    assert daemon.get_commands(["a", "b"], "key", "openai") == [None, None]
+    assert cache.get_cached_command("a") is None
+
+
+def test_commands_are_stored_even_without_cache_lookup(cache_file, llm):
+    cache.cache_command("a", "ls")
+    assert daemon.get_commands(["a"], "key", "openai") == ["echo a"]
+    assert cache.get_cached_command("a") == "echo a"
+
+
+def _serve_once(socket_path, reply):
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socket_path))
+    server.listen(1)
+
+    def answer():
+        conn, _ = server.accept()
+        with conn:
+            conn.recv(4096)
+            conn.sendall(reply)
+        server.close()
+
+    threading.Thread(target=answer, daemon=True).start()
+
+
+@pytest.mark.parametrize("reply", [b"not json\n", b"[]\n", b""])
+def test_malformed_reply_raises_connection_error(socket_path, reply):
+    _serve_once(socket_path, reply)
+    with pytest.raises(ConnectionError):
+        daemon.request_command("list files")
+
+
+def test_cli_queries_llm_itself_after_malformed_reply(monkeypatch, socket_path):
+    _serve_once(socket_path, b"not json\n")
+    queried = []
+    monkeypatch.setattr(cli, "get_api_key", lambda: ("key", "openai"))
+    monkeypatch.setattr(
+        cli, "get_command_from_llm", lambda prompt, *args, **kwargs: queried.append(prompt) or "ls"
+    )
+    monkeypatch.setattr("sys.argv", ["doforme", "--dry-run", "list", "files"])
+    assert cli.main() == 0
+    assert queried == ["list files"]
+
+
+@pytest.fixture
+def running_daemon(cache_file, llm, socket_path):
+    """Run the daemon's server loop in a background thread."""
+    loop = asyncio.new_event_loop()
+
+    def serve():
+        try:
+            loop.run_until_complete(daemon._serve("key", "openai"))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if socket_path.exists():
+            break
+        time.sleep(0.01)
+    yield
+    loop.call_soon_threadsafe(lambda: [task.cancel() for task in asyncio.all_tasks(loop)])
+    thread.join(5)
+
+
+def test_daemon_no_cache_replaces_cached_command(running_daemon):
+    cache.cache_command("x prompt", "ls -la")
+    assert daemon.request_command("x prompt") == "ls -la"
+    assert daemon.request_command("x prompt", use_cache=False) == "echo x prompt"
+    assert cache.get_cached_command("x prompt") == "echo x prompt"